@@ -1,4 +1,3 @@
-import glob
 import os
 import platform
 import sys
@@ -129,15 +128,23 @@ def test_file_cleanup(*paths):
 def glob_files(path):
     """Get a set of files and directories under the path (inclusive).
 
-    - Note that the path itself in the glob result will be appended an os.sep,
-      and shuould usually be matched with os.path.join(path, '')
-    - Hidden ('.'-leading) files are not included unless include_hidden=True,
-      which is supported since Python 3.11, is provided to glob.
+    - Equivalent to globbing with os.path.join(path, '**') recursively, but
+      walks with os.scandir so that no pattern matching is performed.
+    - Note that the path itself in the result will be appended an os.sep,
+      and shuould usually be matched with os.path.join(path, ''). It is
+      always included, even if it's not an existing directory, as glob does.
+    - Hidden ('.'-leading) files and directories are not included, as glob
+      does.
 
     Returns:
         set: files and directories under the path (inclusive)
     """
-    return {*glob.iglob(os.path.join(glob.escape(path), '**'), recursive=True)}
+    rv = {os.path.join(path, '')}
+    for root, dirs, files in os.walk(path, followlinks=True):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        rv.update(os.path.join(root, d) for d in dirs)
+        rv.update(os.path.join(root, f) for f in files if not f.startswith('.'))
+    return rv
 
 
 class TestFileMixin:
@@ -735,6 +735,30 @@ class TestFilesystemHelpers(unittest.TestCase):
         with self.assertRaises(ValueError):
             wsbapp.file_info(dst, base=os.path.join(root, 'deep', 'subdir', 'file.txt'))
 
+    def test_file_info_entry(self):
+        root = tempfile.mkdtemp(dir=tmpdir)
+        dst = os.path.join(root, 'folder')
+        dst2 = os.path.join(root, 'file.txt')
+        os.makedirs(dst)
+        with open(dst2, 'w') as fh:
+            fh.write('123')
+
+        with os.scandir(root) as entries:
+            entries = {entry.name: entry for entry in entries}
+
+        self.assertEqual(
+            wsbapp.file_info(dst2, entry=entries['file.txt']),
+            ('file.txt', 'file', 3, os.stat(dst2).st_mtime),
+        )
+        self.assertEqual(
+            wsbapp.file_info(dst, entry=entries['folder']),
+            ('folder', 'dir', None, os.stat(dst).st_mtime),
+        )
+        self.assertEqual(
+            wsbapp.file_info(dst2, base=root, entry=entries['file.txt']),
+            ('file.txt', 'file', 3, os.stat(dst2).st_mtime),
+        )
+
     @require_sep()
     def test_file_info_no_altsep(self):
         root = tempfile.mkdtemp(dir=tmpdir)
@@ -861,6 +885,25 @@ class TestFilesystemHelpers(unittest.TestCase):
             ('file.txt', 'file', 3, os.stat(dst4).st_mtime),
         })
 
+    @require_symlink()
+    def test_listdir_symlink(self):
+        root = tempfile.mkdtemp(dir=tmpdir)
+        ref = os.path.join(root, 'folder')
+        ref2 = os.path.join(root, 'folder', 'file.txt')
+        dst = os.path.join(root, 'listdir')
+        dst2 = os.path.join(root, 'listdir', 'symlink')
+        os.makedirs(ref)
+        os.makedirs(dst)
+        with open(ref2, 'w') as fh:
+            fh.write('123')
+        os.symlink(ref, dst2)
+        self.assertEqual(set(wsbapp.listdir(dst)), {
+            ('symlink', 'link', None, os.lstat(dst2).st_mtime),
+        })
+        self.assertEqual(set(wsbapp.listdir(dst, recursive=True)), {
+            ('symlink', 'link', None, os.lstat(dst2).st_mtime),
+        })
+
     def test_zip_file_info(self):
         root = tempfile.mkdtemp(dir=tmpdir)
         zfile = os.path.join(root, 'zipfile.zip')
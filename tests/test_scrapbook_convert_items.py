@@ -1,8 +1,15 @@
+import functools
+import json
 import os
+import re
+import shutil
 import tempfile
 import unittest
 from base64 import b64decode
+from collections import deque
+from contextlib import contextmanager
 from email.utils import format_datetime
+from pathlib import Path
 from unittest import mock
 
 from webscrapbook import WSB_DIR, util
@@ -12,11 +19,50 @@ from webscrapbook.scrapbook.host import Host
 
 from . import TEMP_DIR, TestBookMixin, glob_files
 
+FAVICON_BYTES = b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA')
+
+# meta.js for test_param_type*, formatted with the item type
+META_TYPE_TMPL = b"""scrapbook.meta({
+  "20200101000000000": {
+    "type": "%s",
+    "index": "20200101000000000/index.html"
+  }
+})"""
+
+
+def _write_zip(file, entries):
+    """Write a ZIP file with the given {filename: bytes} entries.
+
+    Returns:
+        dict: {filename: timestamp} of the written entries, as will be read
+            from the file
+    """
+    with zipfile.ZipFile(file, 'w', zipfile.ZIP_STORED, allowZip64=False) as zh:
+        for name, data in entries.items():
+            zh.writestr(name, data)
+
+        # seconds are stored in 2-second precision
+        return {
+            zinfo.filename: util.fs.zip_timestamp(zinfo.date_time[:5] + (zinfo.date_time[5] // 2 * 2,))
+            for zinfo in zh.infolist()
+        }
+
+
+def _get_temp_dir():
+    """Get the root directory for temp test files.
+
+    - Use the RAM-backed /dev/shm, if available, unless TEMP_DIR is set, as
+      the files are only scratch data for the tests.
+    """
+    if TEMP_DIR is None and os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return TEMP_DIR
+
 
 def setUpModule():
     # set up a temp directory for testing
     global _tmpdir, tmpdir
-    _tmpdir = tempfile.TemporaryDirectory(prefix='items-', dir=TEMP_DIR)
+    _tmpdir = tempfile.TemporaryDirectory(prefix='items-', dir=_get_temp_dir())
     tmpdir = os.path.realpath(_tmpdir.name)
 
     # mock out user config
@@ -38,80 +84,110 @@ def tearDownModule():
         mocking.stop()
 
 
+REGEX_META_FILE = re.compile(rb'scrapbook\.meta\((.*)\)', re.S)
+
+
+@functools.lru_cache(maxsize=None)
+def _id_to_local_datetime(id):
+    return util.id_to_datetime(id).astimezone()
+
+
+def _read_meta(root):
+    """Read meta.js of the default book of root without constructing a Host.
+    """
+    data = Path(root, WSB_DIR, 'tree', 'meta.js').read_bytes()
+    return json.loads(REGEX_META_FILE.search(data).group(1))
+
+
 class TestRun(TestBookMixin, unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.maxDiff = 8192
 
+        # Generate read-only sample files shared by tests, which are
+        # hard-linked into the input folder of each test.
+        sample_dir = tempfile.mkdtemp(dir=tmpdir)
+
+        cls._param_format_sample = os.path.join(sample_dir, 'param_format')
+        cls._param_format_sample_mtimes = cls._make_param_format_sample(cls._param_format_sample)
+
+        cls._favicon_sample = os.path.join(sample_dir, 'favicon.bmp')
+        Path(cls._favicon_sample).write_bytes(FAVICON_BYTES)
+
     def setUp(self):
-        """Set up a general temp test folder
+        """Set up a general temp test folder, which is removed after the test
         """
-        self.test_root = tempfile.mkdtemp(dir=tmpdir)
+        tmp = tempfile.TemporaryDirectory(dir=tmpdir)
+        self.addCleanup(tmp.cleanup)
+        self._init_test_dirs(tmp.name)
+
+    def _init_test_dirs(self, root):
+        self.test_root = root
         self.test_input = os.path.join(self.test_root, 'input')
         self.test_input_tree = os.path.join(self.test_input, WSB_DIR, 'tree')
         self.test_output = os.path.join(self.test_root, 'output')
+        self.test_output_tree = os.path.join(self.test_output, WSB_DIR, 'tree')
 
-        os.makedirs(self.test_input_tree, exist_ok=True)
+    @contextmanager
+    def _fresh_dirs(self):
+        """Switch to a fresh temp test folder, which is removed on exit
+        """
+        with tempfile.TemporaryDirectory(dir=tmpdir) as root:
+            self._init_test_dirs(root)
+            yield
 
-    def test_param_type(self):
-        """Check type filter
+    def _test_param_type_sample(self, type):
+        """Generate sample files for test_param_type*
+        """
+        tree_dir = Path(self.test_input_tree)
+        tree_dir.mkdir(parents=True, exist_ok=True)
+        (tree_dir / 'meta.js').write_bytes(META_TYPE_TMPL % type.encode('UTF-8'))
+
+        index_file = Path(self.test_input, '20200101000000000', 'index.html')
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        index_file.write_text("""dummy""", encoding='UTF-8')
+
+    def test_param_type01(self):
+        """Check type filter: items of a listed type are converted
         """
         types = ['', 'site', 'image', 'file', 'combine', 'note', 'postit', 'bookmark', 'folder', 'separator']
         for type in types:
-            with self.subTest(type=type):
-                self.setUp()
-                try:
-                    self.init_book(self.test_input, meta={
-                        '20200101000000000': {
-                            'type': type,
-                            'index': '20200101000000000/index.html',
-                        },
-                    })
-
-                    index_file = os.path.join(self.test_input, '20200101000000000', 'index.html')
-                    os.makedirs(os.path.dirname(index_file), exist_ok=True)
-                    with open(index_file, 'w', encoding='UTF-8') as fh:
-                        fh.write("""dummy""")
-
-                    for _info in conv_items.run(self.test_input, self.test_output, format='htz', types=[type]):
-                        pass
-
-                    self.assertEqual(glob_files(self.test_output), {
-                        os.path.join(self.test_output, ''),
-                        os.path.join(self.test_output, '20200101000000000.htz'),
-                    })
-                finally:
-                    self.tearDown()
-
-                self.setUp()
-                try:
-                    self.init_book(self.test_input, meta={
-                        '20200101000000000': {
-                            'type': type,
-                            'index': '20200101000000000/index.html',
-                        },
-                    })
-
-                    index_file = os.path.join(self.test_input, '20200101000000000', 'index.html')
-                    os.makedirs(os.path.dirname(index_file), exist_ok=True)
-                    with open(index_file, 'w', encoding='UTF-8') as fh:
-                        fh.write("""dummy""")
-
-                    for _info in conv_items.run(self.test_input, self.test_output, format='htz', types=[]):
-                        pass
-
-                    self.assertEqual(glob_files(self.test_output), {
-                        os.path.join(self.test_output, ''),
-                        os.path.join(self.test_output, '20200101000000000'),
-                        os.path.join(self.test_output, '20200101000000000', 'index.html'),
-                    })
-                finally:
-                    self.tearDown()
+            with self.subTest(type=type), self._fresh_dirs():
+                self._test_param_type_sample(type)
 
-    def _test_param_format_sample(self):
-        """Generate sample files for test_param_format_*
+                deque(conv_items.run(self.test_input, self.test_output, format='htz', types=[type]), maxlen=0)
+
+                self.assertEqual(glob_files(self.test_output), {
+                    os.path.join(self.test_output, ''),
+                    os.path.join(self.test_output, '20200101000000000.htz'),
+                })
+
+    def test_param_type02(self):
+        """Check type filter: items of an unlisted type are not converted
         """
-        self.init_book(self.test_input, meta={
+        types = ['', 'site', 'image', 'file', 'combine', 'note', 'postit', 'bookmark', 'folder', 'separator']
+        for type in types:
+            with self.subTest(type=type), self._fresh_dirs():
+                self._test_param_type_sample(type)
+
+                deque(conv_items.run(self.test_input, self.test_output, format='htz', types=[]), maxlen=0)
+
+                self.assertEqual(glob_files(self.test_output), {
+                    os.path.join(self.test_output, ''),
+                    os.path.join(self.test_output, '20200101000000000'),
+                    os.path.join(self.test_output, '20200101000000000', 'index.html'),
+                })
+
+    @classmethod
+    def _make_param_format_sample(cls, root):
+        """Generate the sample files for test_param_format_* under root
+
+        Returns:
+            dict: {archive: {filename: timestamp}} of the archive entries
+        """
+        mtimes = {}
+
+        cls.init_book(root, meta={
             '20200101000000001': {
                 'type': '',
                 'create': '20200101000000000',
@@ -139,43 +215,48 @@ class TestRun(TestBookMixin, unittest.TestCase):
             },
         })
 
-        index_dir = os.path.join(self.test_input, '20200101000000001')
+        index_dir = os.path.join(root, '20200101000000001')
         os.makedirs(index_dir, exist_ok=True)
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""\
+        Path(index_dir, 'index.html').write_text("""\
 <img src="resource.bmp">
 my page content
-""")
-        with open(os.path.join(index_dir, 'resource.bmp'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+""", encoding='UTF-8')
+        Path(index_dir, 'resource.bmp').write_bytes(FAVICON_BYTES)
 
-        index_file = os.path.join(self.test_input, '20200101000000002.htz')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('index.html', """\
+        index_file = os.path.join(root, '20200101000000002.htz')
+        mtimes['20200101000000002.htz'] = _write_zip(index_file, {
+            'index.html': b"""\
 <img src="resource.bmp">
 my page content
-""")
-            zh.writestr('resource.bmp', b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+""",
+            'resource.bmp': FAVICON_BYTES,
+        })
 
-        index_file = os.path.join(self.test_input, '20200101000000003.maff')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('20200101000000003/index.html', """\
+        index_file = os.path.join(root, '20200101000000003.maff')
+        mtimes['20200101000000003.maff'] = _write_zip(index_file, {
+            '20200101000000003/index.html': b"""\
 <img src="resource.bmp">
 my page content
-""")
-            zh.writestr('20200101000000003/index.rdf', """dummy""")
-            zh.writestr('20200101000000003/resource.bmp', b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+""",
+            '20200101000000003/index.rdf': b"""dummy""",
+            '20200101000000003/resource.bmp': FAVICON_BYTES,
+        })
 
-        index_file = os.path.join(self.test_input, '20200101000000004.html')
-        with open(index_file, 'w', encoding='UTF-8') as fh:
-            fh.write("""\
+        index_file = os.path.join(root, '20200101000000004.html')
+        Path(index_file).write_text("""\
 <img src="data:image/bmp;base64,Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA">
 my page content
-""")
+""", encoding='UTF-8')
+
+        index_file = os.path.join(root, '20200101000000005.txt')
+        Path(index_file).write_text("""my page content""", encoding='UTF-8')
 
-        index_file = os.path.join(self.test_input, '20200101000000005.txt')
-        with open(index_file, 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
+        return mtimes
+
+    def _test_param_format_sample(self):
+        """Generate sample files for test_param_format_*
+        """
+        shutil.copytree(self._param_format_sample, self.test_input, copy_function=os.link)
 
     def test_param_format_folder01(self):
         """Test format "folder"
@@ -184,8 +265,7 @@ my page content
         """
         self._test_param_format_sample()
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='folder', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='folder', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -211,17 +291,15 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000001', 'index.html')).st_mtime,
         )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000002.htz')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000002', 'index.html')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000002.htz']['index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000002', 'index.html')).st_mtime,
+        )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000003.maff')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('20200101000000003/index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000003', 'index.html')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000003.maff']['20200101000000003/index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000003', 'index.html')).st_mtime,
+        )
 
         self.assertEqual(
             os.stat(os.path.join(self.test_input, '20200101000000004.html')).st_mtime,
@@ -275,16 +353,15 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.htz')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('index.html', """my page content""")
+        _write_zip(index_file, {
+            'index.html': b"""my page content""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='folder', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='folder', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -292,14 +369,12 @@ my page content
             os.path.join(self.test_output, '20200101000000000', 'index.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000/index.html',
@@ -319,17 +394,16 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.maff')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('20200101000000000/index.html', """my page content""")
-            zh.writestr('20200101000000000/index.rdf', """dummy""")
+        _write_zip(index_file, {
+            '20200101000000000/index.html': b"""my page content""",
+            '20200101000000000/index.rdf': b"""dummy""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='folder', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='folder', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -337,14 +411,12 @@ my page content
             os.path.join(self.test_output, '20200101000000000', 'index.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000/index.html',
@@ -364,16 +436,13 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.html')
-        with open(index_file, 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
+        Path(index_file).write_text("""my page content""", encoding='UTF-8')
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='folder', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='folder', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -381,14 +450,12 @@ my page content
             os.path.join(self.test_output, '20200101000000000', 'index.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000/index.html',
@@ -403,8 +470,7 @@ my page content
         """
         self._test_param_format_sample()
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='htz', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='htz', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -437,11 +503,10 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000002.htz')).st_mtime,
         )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000003.maff')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('20200101000000003/index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000003.htz')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000003.maff']['20200101000000003/index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000003.htz')).st_mtime,
+        )
 
         self.assertEqual(
             os.stat(os.path.join(self.test_input, '20200101000000004.html')).st_mtime,
@@ -453,9 +518,7 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000005.htz')).st_mtime,
         )
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000001': {
                 'type': '',
                 'create': '20200101000000000',
@@ -496,27 +559,22 @@ my page content
 
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
-        with open(os.path.join(index_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        Path(index_dir, 'index.html').write_text("""my page content""", encoding='UTF-8')
+        os.link(self._favicon_sample, os.path.join(index_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='htz', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='htz', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.htz'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.htz',
@@ -536,31 +594,28 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.maff')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('20200101000000000/index.html', """my page content""")
-            zh.writestr('20200101000000000/index.rdf', """dummy""")
+        _write_zip(index_file, {
+            '20200101000000000/index.html': b"""my page content""",
+            '20200101000000000/index.rdf': b"""dummy""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='htz', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='htz', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.htz'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.htz',
@@ -580,30 +635,25 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.html')
-        with open(index_file, 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
+        Path(index_file).write_text("""my page content""", encoding='UTF-8')
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -618,8 +668,7 @@ my page content
         """
         self._test_param_format_sample()
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='maff', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='maff', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -630,6 +679,8 @@ my page content
             os.path.join(self.test_output, '20200101000000005.maff'),
         })
 
+        dt_str = format_datetime(_id_to_local_datetime('20200101000000000'))
+
         with zipfile.ZipFile(os.path.join(self.test_output, '20200101000000001.maff')) as zh:
             self.assertEqual(set(zh.namelist()), {
                 '20200101000000001/',
@@ -638,10 +689,9 @@ my page content
                 '20200101000000001/resource.bmp',
             })
             with zh.open('20200101000000001/index.rdf') as fh:
-                dt = util.id_to_datetime('20200101000000000').astimezone()
                 self.assertEqual(
                     util.parse_maff_index_rdf(fh),
-                    ('', '', format_datetime(dt), 'index.html', 'UTF-8'),
+                    ('', '', dt_str, 'index.html', 'UTF-8'),
                 )
 
         with zipfile.ZipFile(os.path.join(self.test_output, '20200101000000002.maff')) as zh:
@@ -652,10 +702,9 @@ my page content
                 '20200101000000002/resource.bmp',
             })
             with zh.open('20200101000000002/index.rdf') as fh:
-                dt = util.id_to_datetime('20200101000000000').astimezone()
                 self.assertEqual(
                     util.parse_maff_index_rdf(fh),
-                    ('', '', format_datetime(dt), 'index.html', 'UTF-8'),
+                    ('', '', dt_str, 'index.html', 'UTF-8'),
                 )
 
         with zipfile.ZipFile(os.path.join(self.test_output, '20200101000000004.maff')) as zh:
@@ -666,10 +715,9 @@ my page content
                 '20200101000000004/dbc82be549e49d6db9a5719086722a4f1c5079cd.bmp',
             })
             with zh.open('20200101000000004/index.rdf') as fh:
-                dt = util.id_to_datetime('20200101000000000').astimezone()
                 self.assertEqual(
                     util.parse_maff_index_rdf(fh),
-                    ('', '', format_datetime(dt), 'index.html', 'UTF-8'),
+                    ('', '', dt_str, 'index.html', 'UTF-8'),
                 )
 
         with zipfile.ZipFile(os.path.join(self.test_output, '20200101000000005.maff')) as zh:
@@ -680,10 +728,9 @@ my page content
                 '20200101000000005/20200101000000005.txt',
             })
             with zh.open('20200101000000005/index.rdf') as fh:
-                dt = util.id_to_datetime('20200101000000000').astimezone()
                 self.assertEqual(
                     util.parse_maff_index_rdf(fh),
-                    ('', '', format_datetime(dt), 'index.html', 'UTF-8'),
+                    ('', '', dt_str, 'index.html', 'UTF-8'),
                 )
 
         self.assertEqual(
@@ -691,11 +738,10 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000001.maff')).st_mtime,
         )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000002.htz')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000002.maff')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000002.htz']['index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000002.maff')).st_mtime,
+        )
 
         self.assertEqual(
             os.stat(os.path.join(self.test_input, '20200101000000003.maff')).st_mtime,
@@ -712,9 +758,7 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000005.maff')).st_mtime,
         )
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000001': {
                 'type': '',
                 'index': '20200101000000001.maff',
@@ -762,27 +806,25 @@ my page content
 
         index_dir = os.path.join(self.test_input, '20200101000000001')
         os.makedirs(index_dir, exist_ok=True)
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
-        with open(os.path.join(index_dir, 'index.rdf'), 'w', encoding='UTF-8') as fh:
-            fh.write("""dummy""")
-        with open(os.path.join(index_dir, 'resource.txt'), 'w', encoding='UTF-8') as fh:
-            fh.write("""dummy""")
+        Path(index_dir, 'index.html').write_text("""my page content""", encoding='UTF-8')
+        Path(index_dir, 'index.rdf').write_text("""dummy""", encoding='UTF-8')
+        Path(index_dir, 'resource.txt').write_text("""dummy""", encoding='UTF-8')
 
         index_file = os.path.join(self.test_input, '20200101000000002.htz')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('index.html', """my page content""")
-            zh.writestr('index.rdf', """dummy""")
-            zh.writestr('resource.txt', """dummy""")
+        _write_zip(index_file, {
+            'index.html': b"""my page content""",
+            'index.rdf': b"""dummy""",
+            'resource.txt': b"""dummy""",
+        })
 
         index_file = os.path.join(self.test_input, '20200101000000003.maff')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('20200101000000003/index.html', """my page content""")
-            zh.writestr('20200101000000003/index.rdf', """dummy""")
-            zh.writestr('20200101000000003/resource.txt', """dummy""")
+        _write_zip(index_file, {
+            '20200101000000003/index.html': b"""my page content""",
+            '20200101000000003/index.rdf': b"""dummy""",
+            '20200101000000003/resource.txt': b"""dummy""",
+        })
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='maff', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='maff', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -794,9 +836,7 @@ my page content
             os.path.join(self.test_output, '20200101000000003.maff'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000001': {
                 'type': '',
                 'index': '20200101000000001/index.html',
@@ -824,27 +864,22 @@ my page content
 
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
-        with open(os.path.join(index_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        Path(index_dir, 'index.html').write_text("""my page content""", encoding='UTF-8')
+        os.link(self._favicon_sample, os.path.join(index_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='maff', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='maff', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.maff'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.maff',
@@ -864,30 +899,27 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.htz')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('index.html', """my page content""")
+        _write_zip(index_file, {
+            'index.html': b"""my page content""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='maff', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='maff', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.maff'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.maff',
@@ -907,30 +939,25 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.html')
-        with open(index_file, 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
+        Path(index_file).write_text("""my page content""", encoding='UTF-8')
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='maff', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='maff', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.maff'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.maff',
@@ -943,8 +970,7 @@ my page content
         """
         self._test_param_format_sample()
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -978,17 +1004,15 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000001.html')).st_mtime,
         )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000002.htz')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000002.html')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000002.htz']['index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000002.html')).st_mtime,
+        )
 
-        with zipfile.ZipFile(os.path.join(self.test_input, '20200101000000003.maff')) as zh:
-            self.assertEqual(
-                util.fs.zip_timestamp(zh.getinfo('20200101000000003/index.html')),
-                os.stat(os.path.join(self.test_output, '20200101000000003.html')).st_mtime,
-            )
+        self.assertEqual(
+            self._param_format_sample_mtimes['20200101000000003.maff']['20200101000000003/index.html'],
+            os.stat(os.path.join(self.test_output, '20200101000000003.html')).st_mtime,
+        )
 
         self.assertEqual(
             os.stat(os.path.join(self.test_input, '20200101000000004.html')).st_mtime,
@@ -1000,9 +1024,7 @@ my page content
             os.stat(os.path.join(self.test_output, '20200101000000005.txt')).st_mtime,
         )
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000001': {
                 'type': '',
                 'create': '20200101000000000',
@@ -1043,27 +1065,22 @@ my page content
 
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""my page content""")
-        with open(os.path.join(index_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        Path(index_dir, 'index.html').write_text("""my page content""", encoding='UTF-8')
+        os.link(self._favicon_sample, os.path.join(index_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'dbc82be549e49d6db9a5719086722a4f1c5079cd.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -1083,30 +1100,27 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.htz')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('index.html', """my page content""")
+        _write_zip(index_file, {
+            'index.html': b"""my page content""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -1126,31 +1140,28 @@ my page content
         })
 
         index_file = os.path.join(self.test_input, '20200101000000000.maff')
-        with zipfile.ZipFile(index_file, 'w') as zh:
-            zh.writestr('20200101000000000/index.html', """my page content""")
-            zh.writestr('20200101000000000/index.rdf', """dummy""")
+        _write_zip(index_file, {
+            '20200101000000000/index.html': b"""my page content""",
+            '20200101000000000/index.rdf': b"""dummy""",
+        })
 
         favicon_dir = os.path.join(self.test_input_tree, 'favicon')
         os.makedirs(favicon_dir, exist_ok=True)
-        with open(os.path.join(favicon_dir, 'favicon.ico'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(favicon_dir, 'favicon.ico'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
             os.path.join(self.test_output, '20200101000000000.html'),
         })
 
-        self.assertEqual(glob_files(os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon')), {
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', ''),
-            os.path.join(self.test_output, WSB_DIR, 'tree', 'favicon', 'favicon.ico'),
+        self.assertEqual(glob_files(os.path.join(self.test_output_tree, 'favicon')), {
+            os.path.join(self.test_output_tree, 'favicon', ''),
+            os.path.join(self.test_output_tree, 'favicon', 'favicon.ico'),
         })
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -1171,17 +1182,13 @@ my page content
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
 
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""<meta http-equiv="refresh" content="0; url=./refresh1.html">""")
+        Path(index_dir, 'index.html').write_text("""<meta http-equiv="refresh" content="0; url=./refresh1.html">""", encoding='UTF-8')
 
-        with open(os.path.join(index_dir, 'refresh1.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""<meta http-equiv="refresh" content="0; url=./refresh2.html">""")
+        Path(index_dir, 'refresh1.html').write_text("""<meta http-equiv="refresh" content="0; url=./refresh2.html">""", encoding='UTF-8')
 
-        with open(os.path.join(index_dir, 'refresh2.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""page content""")
+        Path(index_dir, 'refresh2.html').write_text("""page content""", encoding='UTF-8')
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -1191,9 +1198,7 @@ my page content
         with open(os.path.join(self.test_output, '20200101000000000.html'), encoding='UTF-8') as fh:
             self.assertEqual(fh.read(), """page content""")
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -1213,23 +1218,19 @@ my page content
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
 
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""<meta http-equiv="refresh" content="0; url=./target.svg">""")
+        Path(index_dir, 'index.html').write_text("""<meta http-equiv="refresh" content="0; url=./target.svg">""", encoding='UTF-8')
 
-        with open(os.path.join(index_dir, 'target.svg'), 'w', encoding='UTF-8') as fh:
-            fh.write("""\
+        Path(index_dir, 'target.svg').write_text("""\
 <?xml version="1.0"?>
 <!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
 <svg xmlns="http://www.w3.org/2000/svg">
   <image href="./image.bmp"/>
 </svg>
-""")
+""", encoding='UTF-8')
 
-        with open(os.path.join(index_dir, 'image.bmp'), 'wb') as fh:
-            fh.write(b64decode(b'Qk08AAAAAAAAADYAAAAoAAAAAQAAAAEAAAABACAAAAAAAAYAAAASCwAAEgsAAAAAAAAAAAAAAP8AAAAA'))
+        os.link(self._favicon_sample, os.path.join(index_dir, 'image.bmp'))
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -1245,9 +1246,7 @@ my page content
 </svg>
 """)
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.svg',
@@ -1267,11 +1266,9 @@ my page content
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
 
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""<meta http-equiv="refresh" content="1; url=./target.html">""")
+        Path(index_dir, 'index.html').write_text("""<meta http-equiv="refresh" content="1; url=./target.html">""", encoding='UTF-8')
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -1281,9 +1278,7 @@ my page content
         with open(os.path.join(self.test_output, '20200101000000000.html'), encoding='UTF-8') as fh:
             self.assertEqual(fh.read(), """<meta http-equiv="refresh" content="1; url=urn:scrapbook:convert:skip:url:./target.html">""")
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
@@ -1303,11 +1298,9 @@ my page content
         index_dir = os.path.join(self.test_input, '20200101000000000')
         os.makedirs(index_dir, exist_ok=True)
 
-        with open(os.path.join(index_dir, 'index.html'), 'w', encoding='UTF-8') as fh:
-            fh.write("""<meta http-equiv="refresh" content="0; url=http://example.com">""")
+        Path(index_dir, 'index.html').write_text("""<meta http-equiv="refresh" content="0; url=http://example.com">""", encoding='UTF-8')
 
-        for _info in conv_items.run(self.test_input, self.test_output, format='single_file', types=['']):
-            pass
+        deque(conv_items.run(self.test_input, self.test_output, format='single_file', types=['']), maxlen=0)
 
         self.assertEqual(glob_files(self.test_output), {
             os.path.join(self.test_output, ''),
@@ -1317,9 +1310,7 @@ my page content
         with open(os.path.join(self.test_output, '20200101000000000.html'), encoding='UTF-8') as fh:
             self.assertEqual(fh.read(), """<meta http-equiv="refresh" content="0; url=http://example.com">""")
 
-        book = Host(self.test_output).books['']
-        book.load_meta_files()
-        self.assertDictEqual(book.meta, {
+        self.assertDictEqual(_read_meta(self.test_output), {
             '20200101000000000': {
                 'type': '',
                 'index': '20200101000000000.html',
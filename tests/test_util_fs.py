@@ -2725,6 +2725,25 @@ class TestHelpers(unittest.TestCase):
         # external_attr
         self.assertEqual(util.fs.zip_mode(zinfo.external_attr), mode)
 
+    def test_zip_has_prefix(self):
+        root = tempfile.mkdtemp(dir=tmpdir)
+        zfile = os.path.join(root, 'zipfile.zip')
+        with zipfile.ZipFile(zfile, 'w') as zh:
+            zh.writestr('file.txt', '123456')
+            zh.writestr('folder/', '')
+            zh.writestr('implicit_folder/.gitkeep', '1234')
+
+        for mode in ('r', 'a'):
+            with self.subTest(mode=mode), zipfile.ZipFile(zfile, mode) as zh:
+                self.assertTrue(util.fs.zip_has_prefix(zh, ''))
+                self.assertTrue(util.fs.zip_has_prefix(zh, 'file'))
+                self.assertTrue(util.fs.zip_has_prefix(zh, 'file.txt'))
+                self.assertTrue(util.fs.zip_has_prefix(zh, 'folder/'))
+                self.assertTrue(util.fs.zip_has_prefix(zh, 'implicit_folder/'))
+                self.assertFalse(util.fs.zip_has_prefix(zh, 'file.txt/'))
+                self.assertFalse(util.fs.zip_has_prefix(zh, 'folder/.gitkeep'))
+                self.assertFalse(util.fs.zip_has_prefix(zh, 'nonexist'))
+
     def test_zip_check_subpath(self):
         root = tempfile.mkdtemp(dir=tmpdir)
         zfile = os.path.join(root, 'zipfile.zip')
@@ -3069,6 +3088,29 @@ class TestHelpers(unittest.TestCase):
                 zipfile.ZIP_DEFLATED,
             )
 
+    def test_zip_compress_many_files(self):
+        """Files deflated in the pool are written in the walking order."""
+        root = tempfile.mkdtemp(dir=tmpdir)
+        src = os.path.join(root, 'folder')
+        zfile = os.path.join(root, 'archive.zip')
+        os.makedirs(src)
+        for i in range(30):
+            with open(os.path.join(src, f'{i}.txt'), 'w', encoding='UTF-8') as fh:
+                fh.write(f'{i} 中文' * i)
+            with open(os.path.join(src, f'{i}.jpg'), 'w', encoding='UTF-8') as fh:
+                fh.write(f'{i} image' * i)
+
+        util.fs.zip_compress(zfile, src, '')
+
+        with zipfile.ZipFile(zfile) as zh:
+            self.assertIsNone(zh.testzip())
+            self.assertEqual(zh.namelist(), sorted(zh.namelist(), key=os.listdir(src).index))
+            for i in range(30):
+                self.assertEqual(zh.getinfo(f'{i}.txt').compress_type, zipfile.ZIP_DEFLATED)
+                self.assertEqual(zh.read(f'{i}.txt').decode('UTF-8'), f'{i} 中文' * i)
+                self.assertEqual(zh.getinfo(f'{i}.jpg').compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(zh.read(f'{i}.jpg').decode('UTF-8'), f'{i} image' * i)
+
     def test_zip_compress_dir_stream(self):
         root = tempfile.mkdtemp(dir=tmpdir)
         src = os.path.join(root, 'folder')
@@ -3382,6 +3424,35 @@ class TestHelpers(unittest.TestCase):
                 zh.getinfo('newdir/file2.txt').date_time,
             )
 
+    def test_zip_copy_file_compressed(self):
+        """Compressed data should be copied as is."""
+        root = tempfile.mkdtemp(dir=tmpdir)
+        zfile = os.path.join(root, 'archive.zip')
+        zfile2 = os.path.join(root, 'archive2.zip')
+        with zipfile.ZipFile(zfile, 'w') as zh:
+            zh.writestr('file.txt', b'abc' * 1000, compress_type=zipfile.ZIP_DEFLATED)
+            zh.writestr('中文.txt', b'xyz' * 1000, compress_type=zipfile.ZIP_BZIP2)
+
+        with zipfile.ZipFile(zfile2, 'w') as zh:
+            zh.writestr('other.txt', b'123')
+
+        with zipfile.ZipFile(zfile) as zi, \
+             zipfile.ZipFile(zfile2, 'a') as zh:
+            util.fs.zip_copy(zi, 'file.txt', zh, 'newdir/file2.txt')
+            util.fs.zip_copy(zi, '中文.txt', zh, 'newdir/中文2.txt')
+
+        with zipfile.ZipFile(zfile) as zi, \
+             zipfile.ZipFile(zfile2) as zh:
+            self.assertIsNone(zh.testzip())
+            for name, name2 in (('file.txt', 'newdir/file2.txt'), ('中文.txt', 'newdir/中文2.txt')):
+                zinfo = zi.getinfo(name)
+                zinfo2 = zh.getinfo(name2)
+                self.assertEqual(zinfo2.compress_type, zinfo.compress_type)
+                self.assertEqual(zinfo2.compress_size, zinfo.compress_size)
+                self.assertEqual(zinfo2.CRC, zinfo.CRC)
+                self.assertEqual(zh.read(zinfo2), zi.read(zinfo))
+            self.assertEqual(zh.read('other.txt'), b'123')
+
     def test_zip_copy_file_to_root(self):
         root = tempfile.mkdtemp(dir=tmpdir)
         zfile = os.path.join(root, 'archive.zip')
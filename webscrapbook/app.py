@@ -3,8 +3,10 @@
 import datetime
 import functools
 import hashlib
+import itertools
 import json
 import os
+import stat
 import time
 import traceback
 import types
@@ -1737,15 +1739,17 @@ def make_app(root='.', config=None):
 FileInfo = namedtuple('FileInfo', ('name', 'type', 'size', 'last_modified'))
 
 
-def file_info(file, base=None):
+def file_info(file, base=None, entry=None):
     """Read basic file information.
 
     Args:
         file: path of the file
         base: path that the result filename is based under
+        entry: os.DirEntry of the file, whose cached stat info is used if
+            provided
     """
     if base is None:
-        name = os.path.basename(file)
+        name = os.path.basename(file) if entry is None else entry.name
     else:
         base = os.path.join(base, '')
         if not file.startswith(base):
@@ -1754,7 +1758,7 @@ def file_info(file, base=None):
         name = util.unify_pathsep(file[len(base):])
 
     try:
-        statinfo = os.lstat(file)
+        statinfo = os.lstat(file) if entry is None else entry.stat(follow_symlinks=False)
     except OSError:
         # unexpected error when getting stat info
         statinfo = None
@@ -1764,13 +1768,16 @@ def file_info(file, base=None):
         size = statinfo.st_size
         last_modified = statinfo.st_mtime
 
-    if not os.path.lexists(file):
+    # the lstat info is enough to tell the type
+    if statinfo is None:
         type = None
-    elif os.path.islink(file) or util.fs.isjunction(file):
+    elif (stat.S_ISLNK(statinfo.st_mode)
+            or getattr(statinfo, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT):
+        # symlink or directory junction
         type = 'link'
-    elif os.path.isdir(file):
+    elif stat.S_ISDIR(statinfo.st_mode):
         type = 'dir'
-    elif os.path.isfile(file):
+    elif stat.S_ISREG(statinfo.st_mode):
         type = 'file'
     else:
         type = 'unknown'
@@ -1787,26 +1794,45 @@ def listdir(base, recursive=False):
     if not recursive:
         with os.scandir(base) as entries:
             for entry in entries:
-                info = file_info(entry.path)
+                info = file_info(entry.path, entry=entry)
                 if info.type is None:
                     continue
                 yield info
 
     else:
-        for root, dirs, files in os.walk(base):
-            for dir in dirs:
-                file = os.path.join(root, dir)
-                info = file_info(file, base)
-                if info.type is None:
-                    continue
-                yield info
-            for file in files:
-                file = os.path.join(root, file)
-                info = file_info(file, base)
+        # walk top-down like os.walk(), but reuse the scandir entries
+        stack = [base]
+        while stack:
+            root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            dirs = []
+            files = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+
+            for entry in itertools.chain(dirs, files):
+                info = file_info(entry.path, base, entry=entry)
                 if info.type is None:
                     continue
                 yield info
 
+            for entry in reversed(dirs):
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink:
+                    stack.append(entry.path)
+
 
 #########################################################################
 # ZIP helpers
@@ -1860,9 +1886,8 @@ def zip_file_info(zip, subpath, base=None, check_implicit_dir=False):
 
         if check_implicit_dir:
             base = subpath + ('/' if subpath else '')
-            for entry in zh.namelist():
-                if entry.startswith(base):
-                    return FileInfo(name=name, type='dir', size=None, last_modified=None)
+            if util.fs.zip_has_prefix(zh, base):
+                return FileInfo(name=name, type='dir', size=None, last_modified=None)
 
     return FileInfo(name=name, type=None, size=None, last_modified=None)
 
@@ -1887,32 +1912,64 @@ def zip_listdir(zip, subpath, recursive=False):
     dir_exist = not base
     entries = {}
 
+    # ZipInfo by the name under base; a later one of a duplicated name wins,
+    # as in NameToInfo
+    infos = {}
+
     with nullcontext(zip) if isinstance(zip, zipfile.ZipFile) else zipfile.ZipFile(zip) as zh:
-        for filename in zh.namelist():
+        for zinfo in zh.infolist():
+            filename = zinfo.filename
             if not filename.startswith(base):
                 continue
 
+            entry = filename[base_len:]
+            infos[entry] = zinfo
+
             if filename == base:
                 dir_exist = True
                 continue
 
-            entry = filename[base_len:]
             if not recursive:
                 entry, _, _ = entry.partition('/')
                 entries.setdefault(entry, True)
             else:
-                parts = entry.rstrip('/').split('/')
-                for i in range(0, len(parts)):
-                    entry = '/'.join(parts[0:i + 1])
-                    entries.setdefault(entry, True)
+                # add the entry and its ancestors, top-down; stop at the first
+                # known ancestor, whose ancestors must all have been added
+                entry = entry.rstrip('/')
+                if entry in entries:
+                    continue
+                missing = [entry]
+                pos = entry.rfind('/')
+                while pos != -1:
+                    parent = entry[:pos]
+                    if parent in entries:
+                        break
+                    missing.append(parent)
+                    pos = entry.rfind('/', 0, pos)
+                for entry in reversed(missing):
+                    entries[entry] = True
 
         if not entries and not dir_exist:
             raise ZipDirNotFoundError(f'Directory {base!r} does not exist in the zip.')
 
+        # same as zip_file_info(zh, base + entry, base), with the ZipInfo(s)
+        # collected above
         for entry in entries:
-            info = zip_file_info(zh, base + entry, base)
+            info = infos.get(entry)
+            if info is not None:
+                yield FileInfo(
+                    name=entry, type='file',
+                    size=info.file_size,
+                    last_modified=util.fs.zip_timestamp(info),
+                )
+                continue
 
-            if info.type is None:
-                yield FileInfo(name=entry, type='dir', size=None, last_modified=None)
-            else:
-                yield info
+            info = infos.get(entry + '/')
+            if info is not None:
+                yield FileInfo(
+                    name=entry, type='dir', size=None,
+                    last_modified=util.fs.zip_timestamp(info),
+                )
+                continue
+
+            yield FileInfo(name=entry, type='dir', size=None, last_modified=None)
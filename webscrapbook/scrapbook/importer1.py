@@ -1,11 +1,8 @@
 """Legacy module for importing version 1 *.wsba"""
-import copy
 import json
 import os
-import re
 import time
-import traceback
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from urllib.request import pathname2url
 
@@ -14,7 +11,54 @@ from .._polyfill import zipfile
 from ..util import Info
 from .host import Host
 
-REGEX_TARGET_FILENAME_FORMATTER = re.compile(r'%([^%]*)%')
+WSBA_EXTS = ('.wsba',)
+
+TARGET_FILENAME_KEYS = {
+    'ID': lambda importer, id, meta, export_info: id,
+    'EID': lambda importer, id, meta, export_info: export_info['id'],
+    'UUID': lambda importer, id, meta, export_info: _generate_uuid(),
+    'TITLE': lambda importer, id, meta, export_info: meta.get('title', ''),
+    'SOURCE': lambda importer, id, meta, export_info: meta.get('source', ''),
+}
+
+TARGET_FILENAME_DATE_KEYS = {
+    'CREATE': lambda meta, export_info: meta.get('create', ''),
+    'MODIFY': lambda meta, export_info: meta.get('modify', ''),
+    'EXPORT': lambda meta, export_info: export_info['timestamp'],
+}
+
+UTC_DATE_PATTERNS = {
+    'UTC_DATE': '{0.year:04d}-{0.month:02d}-{0.day:02d}',
+    'UTC_TIME': '{0.hour:02d}-{0.minute:02d}-{0.second:02d}',
+    'UTC_YEAR': '{0.year:04d}',
+    'UTC_MONTH': '{0.month:02d}',
+    'UTC_DAY': '{0.day:02d}',
+    'UTC_HOURS': '{0.hour:02d}',
+    'UTC_MINUTES': '{0.minute:02d}',
+    'UTC_SECONDS': '{0.second:02d}',
+}
+
+LOCAL_DATE_PATTERNS = {
+    'DATE': '{0.year:04d}-{0.month:02d}-{0.day:02d}',
+    'TIME': '{0.hour:04d}-{0.minute:02d}-{0.second:02d}',
+    'YEAR': '{0.year:04d}',
+    'MONTH': '{0.month:02d}',
+    'DAY': '{0.day:02d}',
+    'HOURS': '{0.hour:02d}',
+    'MINUTES': '{0.minute:02d}',
+    'SECONDS': '{0.second:02d}',
+}
+
+
+def _generate_uuid():
+    import uuid
+    return str(uuid.uuid4())
+
+
+def _make_date_token(getter, pattern):
+    def render(importer, id, meta, export_info):
+        return str(importer._format_date(getter(meta, export_info), pattern))
+    return render
 
 
 class Importer():
@@ -55,19 +99,27 @@ class Importer():
         self.target_id = target_id
         self.target_index = target_index if (isinstance(target_index, int) and target_index >= 0) else None
         self.target_filename = target_filename or '%ID%'
+        self._target_filename_tokens = self._parse_target_filename(self.target_filename)
         self.rebuild_folders = rebuild_folders
         self.prune = prune
         self.resolve_id_used = resolve_id_used
 
+        self._data_dir_prefix = os.path.join(self.book.data_dir, '')
+        self._favicon_dir_prefix = os.path.join(self.book.tree_dir, 'favicon', '')
+        self._wsba_cache = {}
+        self._dt_cache = {}
+        self._ldt_cache = {}
+
     def run(self, files=None):
         self.book.load_meta_files()
         self.book.load_toc_files()
 
         self.map_eid_to_info = {}
         self.map_id_to_new_id = {}
-
-        book_meta_orig = copy.deepcopy(self.book.meta)
-        book_toc_orig = copy.deepcopy(self.book.toc)
+        self._toc_parent_cache = {}
+        self._dir_cache = set()
+        self._meta_dirty = False
+        self._toc_dirty = False
 
         # fix target_id
         if not self.rebuild_folders:
@@ -80,7 +132,9 @@ class Importer():
         for file in files:
             if os.path.isdir(file):
                 with os.scandir(file) as entries:
-                    srcs = sorted(f.path for f in entries if util.is_wsba(f.path))
+                    srcs = [e.path for e in entries if e.name.lower().endswith(WSBA_EXTS) and e.is_file()]
+                srcs.sort()
+                self._prefetch_export_files(srcs)
             elif os.path.isfile(file):
                 if not util.is_wsba(file):
                     yield Info('warn', f'Skipped invalid file {os.path.basename(file)!r}')
@@ -99,23 +153,24 @@ class Importer():
                     yield Info('error', f'Failed to import file {os.path.basename(src)!r}: {exc}', exc=exc)
                 except Exception as exc:
                     # unexpected error
+                    import traceback
                     traceback.print_exc()
                     yield Info('error', f'Failed to import file {os.path.basename(src)!r}: {exc}', exc=exc)
                 else:
                     # finalize a successful import
                     text_parent = '' if parent_id is None else f' (under {parent_id!r})'
                     yield Info('info', f'Imported {id!r}{text_parent}')
-                    self.map_eid_to_info.setdefault(eid, {}).setdefault('id', id)
+                    self.map_eid_to_info[eid].setdefault('id', id)
                     if self.prune:
                         yield Info('debug', f'Removing {os.path.basename(src)!r} (prune)')
                         os.remove(src)
 
         # update files
-        if self.book.meta != book_meta_orig:
+        if self._meta_dirty:
             yield Info('info', 'Saving changed meta files...')
             self.book.save_meta_files()
 
-        if self.book.toc != book_toc_orig:
+        if self._toc_dirty:
             yield Info('info', 'Saving changed TOC files...')
             self.book.save_toc_files()
 
@@ -123,146 +178,171 @@ class Importer():
         """Generate an adequate filename (without file extension) for an
         importing item.
         """
-        def date_formatter(id, pattern):
-            if pattern == '':
-                return id
-
-            dt = util.id_to_datetime(id)
-
-            if not dt:
-                return ''
-
-            if pattern == 'UTC_DATE':
-                return f'{dt.year:04d}-{dt.month:02d}-{dt.day:02d}'
-
-            if pattern == 'UTC_TIME':
-                return f'{dt.hour:02d}-{dt.minute:02d}-{dt.second:02d}'
-
-            if pattern == 'UTC_YEAR':
-                return f'{dt.year:04d}'
-
-            if pattern == 'UTC_MONTH':
-                return f'{dt.month:02d}'
-
-            if pattern == 'UTC_DAY':
-                return f'{dt.day:02d}'
-
-            if pattern == 'UTC_HOURS':
-                return f'{dt.hour:02d}'
-
-            if pattern == 'UTC_MINUTES':
-                return f'{dt.minute:02d}'
-
-            if pattern == 'UTC_SECONDS':
-                return f'{dt.second:02d}'
-
-            ldt = dt.astimezone()
-
-            if pattern == 'DATE':
-                return f'{ldt.year:04d}-{ldt.month:02d}-{ldt.day:02d}'
+        filename = ''.join(
+            token if isinstance(token, str) else token(self, id, meta, export_info)
+            for token in self._target_filename_tokens
+        )
+        filename = '/'.join(util.validate_filename(s) for s in filename.split('/'))
+        return filename
 
-            if pattern == 'TIME':
-                return f'{ldt.hour:04d}-{ldt.minute:02d}-{ldt.second:02d}'
+    @staticmethod
+    def _parse_target_filename(template):
+        """Parse a target filename template into a list of tokens.
 
-            if pattern == 'YEAR':
-                return f'{ldt.year:04d}'
+        Each token is either a literal string or a callable that renders the
+        value of a key for an importing item.
+        """
+        # parts at odd indexes are keys enclosed by '%', except for the last
+        # one if it's not closed
+        parts = template.split('%')
+        if len(parts) % 2 == 0:
+            parts[-2:] = [f'{parts[-2]}%{parts[-1]}']
+
+        tokens = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                if part:
+                    tokens.append(part)
+                continue
 
-            if pattern == 'MONTH':
-                return f'{ldt.month:02d}'
+            if part == '':
+                tokens.append('%')
+                continue
 
-            if pattern == 'DAY':
-                return f'{ldt.day:02d}'
+            func = TARGET_FILENAME_KEYS.get(part)
+            if func is not None:
+                tokens.append(func)
+                continue
 
-            if pattern == 'HOURS':
-                return f'{ldt.hour:02d}'
+            key, _, pattern = part.partition(':')
+            getter = TARGET_FILENAME_DATE_KEYS.get(key)
+            if getter is not None:
+                tokens.append(_make_date_token(getter, pattern))
+        return tokens
 
-            if pattern == 'MINUTES':
-                return f'{ldt.minute:02d}'
+    def _format_date(self, id, pattern):
+        if pattern == '':
+            return id
 
-            if pattern == 'SECONDS':
-                return f'{ldt.second:02d}'
+        try:
+            dt = self._dt_cache[id]
+        except KeyError:
+            dt = self._dt_cache[id] = util.id_to_datetime(id)
 
+        if not dt:
             return ''
 
-        def formatter(m):
-            key = m.group(1)
-
-            if key == '':
-                return '%'
-
-            if key == 'ID':
-                return id
-
-            if key == 'EID':
-                return export_info['id']
-
-            if key == 'UUID':
-                return str(uuid.uuid4())
-
-            if key == 'TITLE':
-                return meta.get('title', '')
-
-            if key == 'SOURCE':
-                return meta.get('source', '')
-
-            key, _, pattern = key.partition(':')
-
-            if key == 'CREATE':
-                return str(date_formatter(meta.get('create', ''), pattern))
-
-            if key == 'MODIFY':
-                return str(date_formatter(meta.get('modify', ''), pattern))
-
-            if key == 'EXPORT':
-                return str(date_formatter(export_info['timestamp'], pattern))
+        fmt = UTC_DATE_PATTERNS.get(pattern)
+        if fmt is not None:
+            return fmt.format(dt)
 
+        fmt = LOCAL_DATE_PATTERNS.get(pattern)
+        if fmt is None:
             return ''
 
-        filename = REGEX_TARGET_FILENAME_FORMATTER.sub(formatter, self.target_filename)
-        filename = '/'.join(util.validate_filename(s) for s in filename.split('/'))
-        return filename
-
-    def _import_file(self, file):
-        with zipfile.ZipFile(file) as zh:
-            try:
-                with zh.open('export.json') as fh:
-                    export_info = json.load(fh)
-            except Exception as exc:
-                raise RuntimeError(f"Unable to read 'export.json': {exc}") from exc
+        try:
+            ldt = self._ldt_cache[id]
+        except KeyError:
+            ldt = self._ldt_cache[id] = dt.astimezone()
 
-            if export_info['version'] == 1:
-                try:
-                    assert isinstance(export_info['id'], str)
-                    assert isinstance(export_info['timestamp'], str)
-                    assert isinstance(export_info['timezone'], float)
-                    assert isinstance(export_info['path'], list)
-                except (AssertionError, KeyError) as exc:
-                    raise RuntimeError("Malformed 'export.json'") from exc
+        return fmt.format(ldt)
 
-            else:
-                raise RuntimeError(f'Unsupported archive version: {export_info["version"]!r}')
+    def _import_file(self, file):
+        # reuse the parsed export.json and meta.json if the same file has
+        # been loaded before
+        cache_key = self._get_wsba_cache_key(file)
 
+        zh = None
+        try:
             try:
-                with zh.open('meta.json') as fh:
-                    meta = json.load(fh)
-            except Exception as exc:
-                raise RuntimeError(f"Unable to read 'meta.json': {exc}") from exc
+                export_info, meta = self._wsba_cache[cache_key]
+            except KeyError:
+                zh = zipfile.ZipFile(file)
+                export_info, meta = self._load_export_file(zh)
+                self._wsba_cache[cache_key] = (export_info, meta)
 
+            meta = meta.copy()
             id = meta.pop('id')
             if id in self.book.SPECIAL_ITEM_ID:
                 raise RuntimeError(f'invalid ID {id!r}')
 
+            eid = export_info['id']
+            try:
+                eid_info = self.map_eid_to_info[eid]
+            except KeyError:
+                eid_info = self.map_eid_to_info[eid] = {'refs': set()}
+
             # skip importing data for a duplicated occurrence of a previously
             # imported item
-            imported_id = self.map_eid_to_info.setdefault(export_info['id'], {}).get('id')
+            imported_id = eid_info.get('id')
             if imported_id is not None:
                 id = imported_id
                 yield Info('debug', f'Skipped importing data for multi-referenced {id!r}')
             else:
+                if zh is None:
+                    zh = zipfile.ZipFile(file)
                 id = yield from self._import_meta_and_data(id, meta, zh, export_info)
+        finally:
+            if zh is not None:
+                zh.close()
+
+        parent_id = yield from self._insert_to_toc(id, export_info)
+        return id, eid, parent_id
+
+    @staticmethod
+    def _get_wsba_cache_key(file):
+        st = os.stat(file)
+        return (file, st.st_mtime_ns, st.st_size)
 
-            parent_id = yield from self._insert_to_toc(id, export_info)
-            return id, export_info['id'], parent_id
+    def _prefetch_export_files(self, files):
+        """Load export.json and meta.json of archive files in parallel."""
+        if len(files) <= 1:
+            return
+
+        def load(file):
+            try:
+                cache_key = self._get_wsba_cache_key(file)
+                with zipfile.ZipFile(file) as zh:
+                    self._wsba_cache[cache_key] = self._load_export_file(zh)
+            except Exception:
+                # leave the error to be reported when the file is imported
+                pass
+
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            for _ in executor.map(load, files):
+                pass
+
+    def _load_export_file(self, zh):
+        """Load and validate export.json and meta.json of an archive file.
+
+        Returns:
+            tuple: (export_info, meta)
+        """
+        try:
+            with zh.open('export.json') as fh:
+                export_info = json.load(fh)
+        except Exception as exc:
+            raise RuntimeError(f"Unable to read 'export.json': {exc}") from exc
+
+        if export_info['version'] == 1:
+            try:
+                assert isinstance(export_info['id'], str)
+                assert isinstance(export_info['timestamp'], str)
+                assert isinstance(export_info['timezone'], float)
+                assert isinstance(export_info['path'], list)
+            except (AssertionError, KeyError) as exc:
+                raise RuntimeError("Malformed 'export.json'") from exc
+
+        else:
+            raise RuntimeError(f'Unsupported archive version: {export_info["version"]!r}')
+
+        try:
+            with zh.open('meta.json') as fh:
+                meta = json.load(fh)
+        except Exception as exc:
+            raise RuntimeError(f"Unable to read 'meta.json': {exc}") from exc
+
+        return export_info, meta
 
     def _import_meta_and_data(self, id, meta, zh, export_info):
         """Import meta and data
@@ -272,21 +352,11 @@ class Importer():
         """
         index = meta.get('index', '')
 
-        if index:
-            if index.endswith('/index.html'):
-                src = f'data/{os.path.dirname(index)}'
-            else:
-                src = f'data/{index}'
-
-            # determine normal copy dst
-            _, ext = os.path.splitext(src)
-            filename = self.generate_imported_filename(id, meta, export_info) + ext
-            dst = os.path.normpath(os.path.join(self.book.data_dir, filename))
-            meta['index'] = filename + ('/index.html' if index.endswith('/index.html') else '')
-
         # handle resolve cases if id exists
-        # may overwrite id, dst, and meta['index']
+        # may overwrite id, and set dst and meta['index'] for an in-place
+        # replacement
         new_id = id
+        replaced = False
         if id in self.book.meta:
             if self.resolve_id_used == 'skip':
                 raise RuntimeError(f'ID {id!r} already exists')
@@ -316,22 +386,33 @@ class Importer():
                         util.fs.delete(dst)
                     except util.fs.FSEntryNotFoundError:
                         pass
+                    self._dir_cache.clear()
 
-                self.map_eid_to_info.setdefault(export_info['id'], {}).setdefault('replaced', True)
+                self.map_eid_to_info[export_info['id']].setdefault('replaced', True)
+                replaced = True
 
             elif self.resolve_id_used == 'new':
                 new_id = self.book.get_unique_id()
                 yield Info('warn', f'Importing duplicated {id!r} as {new_id!r}...')
 
-                if index:
-                    # overwrite dst and index
-                    filename = self.generate_imported_filename(new_id, meta, export_info) + ext
-                    dst = os.path.normpath(os.path.join(self.book.data_dir, filename))
-                    meta['index'] = filename + ('/index.html' if index.endswith('/index.html') else '')
-
             else:
                 raise RuntimeError(f'unknown resolve mode: {self.resolve_id_used!r}')
 
+        if index:
+            if index.endswith('/index.html'):
+                src = f'data/{os.path.dirname(index)}'
+            else:
+                src = f'data/{index}'
+
+            # determine normal copy dst
+            if not replaced:
+                _, ext = os.path.splitext(src)
+                filename = self.generate_imported_filename(new_id, meta, export_info) + ext
+                # filename consists of validated components, which won't be
+                # empty or contain '.' or '..', and needs no normalization
+                dst = self._data_dir_prefix + filename.replace('/', os.sep)
+                meta['index'] = filename + ('/index.html' if index.endswith('/index.html') else '')
+
         # if a new folder for id has been generated, replace it with new_id
         # (e.g. when X/Y has been imported before Z/X, there will be an X' when
         # importing X under Z)
@@ -346,6 +427,9 @@ class Importer():
             except KeyError:
                 # folder_id not in toc
                 pass
+            else:
+                self._toc_parent_cache.pop(folder_id, None)
+                self._toc_parent_cache.pop(new_id, None)
 
             # @TODO: better algorithm for the global replacement
             for toc in self.book.toc.values():
@@ -354,6 +438,7 @@ class Importer():
                         toc[i] = new_id
 
             del self.book.meta[folder_id]
+            self._meta_dirty = self._toc_dirty = True
 
         # mark id as generated
         self.map_id_to_new_id[id] = new_id
@@ -364,16 +449,22 @@ class Importer():
                 raise RuntimeError(f'file {dst!r} already exists')
 
             yield Info('debug', f'Extracting data files to {self.book.get_subpath(dst)!r}')
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            self._ensure_dir(os.path.dirname(dst))
             util.fs.zip_extract(zh, dst, src)
 
         # import favicon
-        for f in zh.namelist():
-            if f.startswith('favicon/') and not f.endswith('/'):
-                basename = os.path.basename(f)
-                iconfile = os.path.join(self.book.tree_dir, 'favicon', basename)
-                os.makedirs(os.path.dirname(iconfile), exist_ok=True)
-
+        f = next((
+            zinfo.filename for zinfo in zh.infolist()
+            if zinfo.filename.startswith('favicon/') and not zinfo.filename.endswith('/')
+        ), None)
+        if f is not None:
+            basename = os.path.basename(f)
+            iconfile = self._favicon_dir_prefix + basename
+
+            if os.path.lexists(iconfile):
+                yield Info('debug', f'Skipped existing favicon cache {basename!r}')
+            else:
+                self._ensure_dir(self._favicon_dir_prefix)
                 try:
                     util.fs.zip_extract(zh, iconfile, f)
                 except FileExistsError:
@@ -381,40 +472,51 @@ class Importer():
                 else:
                     yield Info('info', f'Added favicon cache {basename!r}')
 
-                # rewrite icon property to be consistent with the importing book
-                try:
-                    base = dst if index.endswith('/index.html') else os.path.dirname(dst)
-                except UnboundLocalError:
-                    base = self.book.data_dir
-                meta['icon'] = pathname2url(os.path.relpath(iconfile, base))
-
-                break
+            # rewrite icon property to be consistent with the importing book
+            try:
+                base = dst if index.endswith('/index.html') else os.path.dirname(dst)
+            except UnboundLocalError:
+                base = self.book.data_dir
+            meta['icon'] = pathname2url(os.path.relpath(iconfile, base))
 
         self.book.meta[new_id] = meta
+        self._meta_dirty = True
         return new_id
 
+    def _ensure_dir(self, path):
+        """Make sure a directory exists, assuming that a directory ensured
+        before during the run is not removed afterwards.
+        """
+        if path in self._dir_cache:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._dir_cache.add(path)
+
     def _insert_to_toc(self, id, export_info):
         """Insert the importing item to TOC
 
         Returns:
             string: ID of the parent the item is inserted under
         """
-        if self.map_eid_to_info.setdefault(export_info['id'], {}).get('replaced'):
+        eid_info = self.map_eid_to_info[export_info['id']]
+
+        if eid_info.get('replaced'):
             yield Info('debug', f'Skipped inserting replaced {id!r}')
             return None
 
         # deduplicate by checking the ref_key
+        export_path = export_info['path']
         if self.rebuild_folders:
-            export_path = export_info['path']
-            ref_key = export_path[-1]['id']
+            direct_parent_id = ref_key = export_path[-1]['id']
         else:
             ref_key = self.target_id
 
-        if ref_key in self.map_eid_to_info[export_info['id']].setdefault('refs', set()):
+        refs = eid_info['refs']
+        if ref_key in refs:
             yield Info('debug', f'Skipped inserting multi-referenced {id!r}')
             return None
 
-        self.map_eid_to_info[export_info['id']]['refs'].add(ref_key)
+        refs.add(ref_key)
 
         # perform the insertion
         if not self.rebuild_folders:
@@ -441,14 +543,31 @@ class Importer():
             i = -1
             parent_id = self.book.ROOT_ITEM_ID
 
+        # generate the missing ancestor folders in a batch, which are inserted
+        # to TOC in the loop below
+        missing_folders = {}
+        for folder in export_path[i + 1:]:
+            folder_id = folder['id']
+            if folder_id == id or folder_id in self.map_id_to_new_id or folder_id in missing_folders:
+                continue
+            missing_folders[folder_id] = {
+                'title': folder['title'],
+                'type': 'folder',
+            }
+
+        generated_folders = {}
+        if missing_folders:
+            new_items = self.book.add_items(missing_folders.values(), None)
+            generated_folders = dict(zip(missing_folders, new_items))
+            self._meta_dirty = True
+
         for j in range(i + 1, len(export_path)):
             folder_id = export_path[j]['id']
-            folder_title = export_path[j]['title']
 
             # special handling for id
             if folder_id == id:
                 new_id = folder_id
-                if parent_id == self.map_id_to_new_id.get(export_path[-1]['id'], export_path[-1]['id']):
+                if parent_id == self.map_id_to_new_id.get(direct_parent_id, direct_parent_id):
                     # this ancestor is identical to the direct parent,
                     # and folder_id will eventually be inserted under it
                     yield Info('debug', f'Skipped inserting {new_id!r} under {parent_id!r} (same as parent)')
@@ -461,12 +580,9 @@ class Importer():
                 try:
                     new_id = self.map_id_to_new_id[folder_id]
                 except KeyError:
-                    new_items = self.book.add_item({
-                        'title': folder_title,
-                        'type': 'folder',
-                    }, parent_id)
-                    new_id = next(iter(new_items))
+                    new_id = generated_folders[folder_id]
                     self.map_id_to_new_id[folder_id] = new_id
+                    self._insert_to_id(new_id, parent_id, allow_insert=False)
                     yield Info('info', f'Generated folder {new_id!r} for missing {folder_id!r} under {parent_id!r}')
                 else:
                     if new_id not in self.book.toc.get(parent_id, ()):
@@ -481,7 +597,10 @@ class Importer():
         return parent_id
 
     def _insert_to_id(self, id, parent_id, allow_insert=True):
-        parent = self.book.toc.setdefault(parent_id, [])
+        try:
+            parent = self._toc_parent_cache[parent_id]
+        except KeyError:
+            parent = self._toc_parent_cache[parent_id] = self.book.toc.setdefault(parent_id, [])
 
         if allow_insert and self.target_index is not None:
             parent.insert(self.target_index, id)
@@ -491,6 +610,8 @@ class Importer():
             target_index = 0 if self.book.config['new_at_top'] else len(parent)
             parent.insert(target_index, id)
 
+        self._toc_dirty = True
+
 
 def run(host, files, book_id='', *, lock=True, **kwargs):
     start = time.time()
@@ -523,6 +644,7 @@ def run(host, files, book_id='', *, lock=True, **kwargs):
             yield from generator.run(files)
 
     except Exception as exc:
+        import traceback
         traceback.print_exc()
         yield Info('critical', str(exc), exc=exc)
         return
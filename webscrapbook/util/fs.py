@@ -1,8 +1,8 @@
 """Virtual filesystem for complex file operation."""
+import bisect
 import copy as _copy
 import functools
 import io
-import itertools
 import os
 import shutil
 import stat
@@ -10,8 +10,10 @@ import subprocess
 import sys
 import tempfile
 import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
-from datetime import datetime
 
 from .._polyfill import mimetypes, zipfile
 from . import util
@@ -147,30 +149,36 @@ def _map_exc(exc, cpath=None):
 
 class CPath:
     """A complex path object representing filesystem path and ZIP subpaths."""
+    __slots__ = ('_path',)
+
     def __new__(cls, pathlike, *subpaths):
-        """Get a singleton new CPath from pathlike."""
+        """Get a singleton new CPath from pathlike.
+
+        The path is set up here rather than in __init__, which would otherwise
+        be run again on a returned singleton.
+        """
         if isinstance(pathlike, cls) and not subpaths:
             return pathlike
-        self = super().__new__(cls)
-        self.__init__(pathlike, *subpaths)
-        return self
 
-    def __init__(self, pathlike, *subpaths):
         if isinstance(pathlike, str):
-            self._path = [pathlike]
+            path = [pathlike]
         elif isinstance(pathlike, CPath):
-            self._path = pathlike.path.copy()
+            path = pathlike.path.copy()
         elif isinstance(pathlike, list):
-            self._path = pathlike.copy()
+            path = pathlike.copy()
         elif isinstance(pathlike, tuple):
-            self._path = list(pathlike)
+            path = list(pathlike)
         elif isinstance(pathlike, dict):
-            self._path = list(pathlike)
+            path = list(pathlike)
         else:  # pathlib.Path etc.
-            self._path = [str(pathlike)]
+            path = [str(pathlike)]
 
         if subpaths:
-            self._path.extend(str(s) for s in subpaths)
+            path.extend(str(s) for s in subpaths)
+
+        self = super().__new__(cls)
+        self._path = path
+        return self
 
     def __str__(self):
         return '!/'.join(self._path)
@@ -186,6 +194,8 @@ class CPath:
         return self._path[key]
 
     def __eq__(self, other):
+        if isinstance(other, CPath):
+            return self._path == other._path
         return self._path == other
 
     def copy(self):
@@ -219,6 +229,12 @@ class CPath:
         Returns:
             CPath
         """
+        # fast path: a plain filesystem path
+        if '!/' not in plainpath:
+            if resolver:
+                return cls([cls._resolve_tidy_subpath(plainpath)])
+            return cls([os.path.normpath(plainpath)])
+
         paths = []
         for start, end in cls._resolve_iter_sep(plainpath):
             archivepath = plainpath[:start]
@@ -258,9 +274,14 @@ class CPath:
             archivepath = cls._resolve_tidy_subpath(subpath[:start], True)
             conflicting = archivepath + '!/'
 
-            if any(i.startswith(conflicting) for i in zh.namelist()):
+            if zip_has_prefix(zh, conflicting):
                 break
 
+            # most separators don't split at an entry; skip them without
+            # raising a KeyError from zh.open()
+            if archivepath not in zh.NameToInfo:
+                continue
+
             try:
                 fh = zh.open(archivepath)
             except KeyError:
@@ -281,18 +302,21 @@ class CPath:
 
     @classmethod
     def _resolve_iter_sep(cls, path):
-        pos = None
-        while True:
-            try:
-                pos = path.rindex('!/', 0, pos)
-            except ValueError:
-                break
+        pos = path.rfind('!/')
+        while pos != -1:
             yield pos, pos + 2
+            pos = path.rfind('!/', 0, pos)
 
     @classmethod
+    @functools.lru_cache(maxsize=1024)
     def _resolve_tidy_subpath(cls, path, striproot=False):
         """Tidy a subpath with possible '.', '..', '//', etc."""
         has_initial_slash = path.startswith('/')
+
+        # fast path: no empty, '.', or '..' component
+        if not (path.startswith('.') or path.endswith('/') or '//' in path or '/.' in path):
+            return path[1:] if has_initial_slash and striproot else path
+
         comps = path.split('/')
         new_comps = []
         for comp in comps:
@@ -390,7 +414,7 @@ def mkzip(cpath):
     try:
         if len(cpath) == 1:
             dst = cpath.file
-            if os.path.lexists(dst) and not os.path.isfile(dst):
+            if _exists_as_nonfile(dst):
                 raise FSIsADirectoryError(cpath)
 
             try:
@@ -428,17 +452,19 @@ def mkzip(cpath):
         raise _map_exc(exc, cpath) from exc
 
 
-def save(cpath, src, *, buffer_size=None):
+def save(cpath, src, *, buffer_size=None, compresslevel=6):
     """Write content to the target.
 
     Args:
         src: bytes or a stream object (with callble 'read' attribute)
+        compresslevel: the compression level for a new compressible entry in
+            a ZIP
     """
     cpath = CPath(cpath)
     try:
         if len(cpath) == 1:
             dst = cpath.file
-            if os.path.lexists(dst) and not os.path.isfile(dst):
+            if _exists_as_nonfile(dst):
                 raise FSIsADirectoryError(cpath)
 
             try:
@@ -465,9 +491,10 @@ def save(cpath, src, *, buffer_size=None):
                     zinfo.date_time = time.localtime()
                 else:
                     zinfo = zipfile.ZipInfo(cpath[-1], time.localtime())
-                    comp = zip_compression_params(mimetypes.guess_type(cpath[-1])[0])
+                    comp = zip_compression_params(_zip_guess_mimetype(cpath[-1]))
                     zinfo.compress_type = comp['compress_type']
-                    zinfo._compresslevel = comp['compresslevel']
+                    if comp['compresslevel'] is not None:
+                        zinfo._compresslevel = compresslevel
 
                 with zh.open(zinfo, 'w') as fh:
                     _save_write(fh, src, buffer_size=buffer_size)
@@ -478,6 +505,26 @@ def save(cpath, src, *, buffer_size=None):
         raise _map_exc(exc, cpath) from exc
 
 
+def _exists_as_nonfile(path):
+    """Check whether path exists but is not a file (or a symlink to a file).
+
+    Same as `os.path.lexists(path) and not os.path.isfile(path)`, but takes
+    only one stat call for a path that is absent or a regular file.
+    """
+    try:
+        st = os.lstat(path)
+    except (OSError, ValueError):
+        return False
+
+    if stat.S_ISLNK(st.st_mode):
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return True
+
+    return not stat.S_ISREG(st.st_mode)
+
+
 def _save_write(fh, src, *, buffer_size=None):
     if isinstance(src, bytes):
         fh.write(src)
@@ -501,11 +548,10 @@ def delete(cpath):
         if len(cpath) == 1:
             dst = cpath.file
 
-            if not os.path.lexists(dst):
-                raise FSEntryNotFoundError(cpath)
-
             try:
                 os.remove(dst)
+            except FileNotFoundError as exc:
+                raise FSEntryNotFoundError(cpath) from exc
             except OSError:
                 shutil.rmtree(dst)
 
@@ -594,21 +640,12 @@ def _check_move(csrc, cdst):
     # ['some/path'] => ['some/path/deeper']
     # ['some/archive.zip'] => ['some/archive.zip', ...]
     # ['some/archive.zip', ...] => ['some/archive.zip']
-    for i in range(1, len(cdst)):
-        dst = cdst[i] + '/'
-        try:
-            src = csrc[i] + '/'
-        except IndexError:
-            # [..., 'some/archive.zip'] => [..., 'some/archive.zip', ...]
-            return False
-
-        if not dst.startswith(src):
-            return True
-
-        if len(dst) > len(src):
+    for src, dst in zip(csrc.path[1:], cdst.path[1:]):
+        if src != dst:
             # [..., 'some/path'] => [..., 'some/path/subpath']
-            return False
+            return not (dst + '/').startswith(src + '/')
 
+    # [..., 'some/archive.zip'] => [..., 'some/archive.zip', ...]
     return False
 
 
@@ -844,12 +881,34 @@ def open_archive_path(cpath, mode='r', *, buffer_size=None):
 # Filesystem handling
 #########################################################################
 
+if os.name == 'nt':
+    import ctypes
+
+    _GetFileAttributesW = ctypes.windll.kernel32.GetFileAttributesW
+    _GetFileAttributesW.argtypes = (ctypes.c_wchar_p,)
+    _GetFileAttributesW.restype = ctypes.c_uint32
+    _INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+else:
+    _GetFileAttributesW = None
+
+
 def isjunction(path):
     """Test whether a path is a junction
 
     - os.path.isjunction is built-in since Python 3.12
     - stat.st_reparse_tag is supported since Python 3.8
     """
+    # On Windows, query the attributes first, which is much cheaper than
+    # os.lstat, and return early for a path that is not a reparse point.
+    if _GetFileAttributesW is not None:
+        try:
+            attrs = _GetFileAttributesW(path)
+        except (ctypes.ArgumentError, TypeError, ValueError):
+            pass
+        else:
+            if attrs != _INVALID_FILE_ATTRIBUTES and not attrs & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+                return False
+
     try:
         st = os.lstat(path)
     except (OSError, ValueError, AttributeError):
@@ -891,6 +950,18 @@ def zip_compression_params(mimetype=None, compress_type=None, compresslevel=None
     }
 
 
+def _zip_guess_mimetype(subpath):
+    """Same as mimetypes.guess_type(subpath)[0], cached by the suffixes."""
+    basename = subpath.rpartition('/')[2].lstrip('.')
+    _, dot, suffixes = basename.partition('.')
+    return _zip_guess_mimetype_by_suffixes(dot + suffixes)
+
+
+@functools.lru_cache(maxsize=256)
+def _zip_guess_mimetype_by_suffixes(suffixes):
+    return mimetypes.guess_type('_' + suffixes)[0]
+
+
 def zip_timestamp(zinfo_or_tuple):
     """Get a compatible timestamp from a ZipInfo.
 
@@ -905,6 +976,12 @@ def zip_timestamp(zinfo_or_tuple):
     else:
         tuple_ = zinfo_or_tuple
 
+    return _zip_mktime(tuple(tuple_))
+
+
+@functools.lru_cache(maxsize=4096)
+def _zip_mktime(tuple_):
+    # entries of an archive often share a (2-second resolution) date_time
     return time.mktime(tuple_ + (0, 0, -1))
 
 
@@ -925,6 +1002,40 @@ def zip_mode(zinfo_or_attr):
     return value >> 16
 
 
+def _zip_sorted_names(zh):
+    """Get a sorted list of entry names of a ZipFile.
+
+    The list is cached for a ZipFile opened for reading, whose entries won't
+    change.
+    """
+    try:
+        return zh._wsb_sorted_names
+    except AttributeError:
+        pass
+
+    names = sorted(zh.NameToInfo)
+    if zh.mode == 'r':
+        zh._wsb_sorted_names = names
+    return names
+
+
+def zip_has_prefix(zip, prefix):
+    """Check whether any entry name in the ZIP starts with prefix.
+
+    Args:
+        zip: path, file-like object, or zipfile.ZipFile
+        prefix: the prefix to check
+    """
+    with nullcontext(zip) if isinstance(zip, zipfile.ZipFile) else zipfile.ZipFile(zip) as zh:
+        # a one-shot sort costs more than a scan for a ZipFile being modified
+        if zh.mode != 'r':
+            return any(name.startswith(prefix) for name in zh.NameToInfo)
+
+        names = _zip_sorted_names(zh)
+        i = bisect.bisect_left(names, prefix)
+        return i < len(names) and names[i].startswith(prefix)
+
+
 def zip_check_subpath(zip, subpath, allow_invalid=False):
     """Check what is at the subpath in the ZIP.
 
@@ -943,35 +1054,21 @@ def zip_check_subpath(zip, subpath, allow_invalid=False):
         if not allow_invalid:
             parts = base.split('/')
             for i in range(len(parts) - 1):
-                chk = '/'.join(parts[:i + 1])
-                try:
-                    zh.getinfo(chk)
-                except KeyError:
-                    pass
-                else:
+                if '/'.join(parts[:i + 1]) in zh.NameToInfo:
                     return ZIP_SUBPATH_INVALID
 
         # check file
-        try:
-            zh.getinfo(base)
-        except KeyError:
-            pass
-        else:
+        if base in zh.NameToInfo:
             return ZIP_SUBPATH_FILE
 
         # check explicit directory
         base += '/'
-        try:
-            zh.getinfo(base)
-        except KeyError:
-            pass
-        else:
+        if base in zh.NameToInfo:
             return ZIP_SUBPATH_DIR
 
         # check descendants for an implicit directory
-        for path in zh.namelist():
-            if path.startswith(base):
-                return ZIP_SUBPATH_DIR_IMPLICIT
+        if zip_has_prefix(zh, base):
+            return ZIP_SUBPATH_DIR_IMPLICIT
 
     return ZIP_SUBPATH_NONE
 
@@ -1008,31 +1105,70 @@ def zip_compress(zip, filename, subpath, filter=None, *,
         pass
 
 
+# files up to this size are deflated in a thread pool by zip_compress
+_ZIP_COMPRESS_POOL_MAX_SIZE = 1 << 22
+_ZIP_COMPRESS_POOL_WORKERS = min(8, os.cpu_count() or 1)
+
+
 def _zip_compress_gen(zh, filename, subpath, filter, *,
                       stream=None, buffer_size=io.DEFAULT_BUFFER_SIZE):
-    with zh as zh:
+    with zh as zh, \
+         nullcontext() if stream else ThreadPoolExecutor(_ZIP_COMPRESS_POOL_WORKERS) as executor:
         errors = []
 
-        for src, dst in _zip_compress_iter(filename, subpath, filter):
+        # files being deflated in the pool, written in the walking order
+        pending = deque()
+
+        def write_pending(limit=0):
+            while len(pending) > limit:
+                src, dst, zinfo, future = pending.popleft()
+                try:
+                    zinfo.CRC, zinfo.file_size, data = future.result()
+                    zinfo.compress_size = len(data)
+                    _zip_write_raw(zh, zinfo, (data,))
+                except OSError as why:
+                    errors.append((src, dst, why))
+
+        for src, dst, entry in _zip_compress_iter(filename, subpath, filter):
             try:
-                zinfo = zipfile.ZipInfo.from_file(src, dst)
+                if entry is None:
+                    zinfo = zipfile.ZipInfo.from_file(src, dst)
+                else:
+                    zinfo = _zip_info_from_stat(entry.stat(), dst)
                 if zinfo.is_dir():
+                    write_pending()
                     zh.writestr(zinfo, b'')
                     if stream:
                         yield stream.get()
                 else:
                     if not stream:
-                        comp = zip_compression_params(mimetypes.guess_type(dst)[0])
+                        comp = zip_compression_params(_zip_guess_mimetype(dst))
                         zinfo.compress_type = comp['compress_type']
                         zinfo._compresslevel = comp['compresslevel']
+
+                        if (zinfo.compress_type == zipfile.ZIP_DEFLATED
+                                and zinfo.file_size <= _ZIP_COMPRESS_POOL_MAX_SIZE
+                                and zh._seekable):
+                            future = executor.submit(_zip_deflate_file, src, comp['compresslevel'], buffer_size)
+                            pending.append((src, dst, zinfo, future))
+                            write_pending(_ZIP_COMPRESS_POOL_WORKERS * 2)
+                            continue
+
+                        write_pending()
+
                     with open(src, 'rb') as ih, zh.open(zinfo, 'w') as oh:
+                        if not stream:
+                            shutil.copyfileobj(ih, oh, buffer_size)
+                            continue
+
                         for chunk in iter(functools.partial(ih.read, buffer_size), b''):
                             oh.write(chunk)
-                            if stream:
-                                yield stream.get()
+                            yield stream.get()
             except OSError as why:
                 errors.append((src, dst, why))
 
+        write_pending()
+
         if errors:
             raise shutil.Error(errors)
 
@@ -1040,38 +1176,109 @@ def _zip_compress_gen(zh, filename, subpath, filter, *,
         yield stream.get()
 
 
+def _zip_deflate_file(src, compresslevel=None, buffer_size=io.DEFAULT_BUFFER_SIZE):
+    """Deflate a file in memory like zipfile does.
+
+    Returns:
+        tuple: (CRC, file size, compressed data)
+    """
+    if compresslevel is None:
+        compresslevel = zlib.Z_DEFAULT_COMPRESSION
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+    chunks = []
+    with open(src, 'rb') as fh:
+        for chunk in iter(functools.partial(fh.read, buffer_size), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk))
+    chunks.append(compressor.flush())
+    return crc, size, b''.join(chunks)
+
+
+def _zip_info_from_stat(st, arcname):
+    """Same as zipfile.ZipInfo.from_file, with a known stat result."""
+    isdir = stat.S_ISDIR(st.st_mode)
+    date_time = time.localtime(st.st_mtime)[0:6]
+
+    arcname = os.path.normpath(os.path.splitdrive(arcname)[1])
+    while arcname[0] in (os.sep, os.altsep):
+        arcname = arcname[1:]
+    if isdir:
+        arcname += '/'
+
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16  # Unix attributes
+    if isdir:
+        zinfo.file_size = 0
+        zinfo.external_attr |= 0x10  # MS-DOS directory flag
+    else:
+        zinfo.file_size = st.st_size
+    return zinfo
+
+
 def _zip_compress_iter(filename, subpath, filter=None):
+    """Generate (src, dst, entry) for the files to add.
+
+    entry is the os.DirEntry of src if available, or None otherwise.
+    """
     if os.path.isfile(filename):
         if not subpath:
             raise ValueError("Unable to add a file at ''")
 
-        yield filename, subpath
+        yield filename, subpath, None
         return
 
     if subpath:
-        yield filename, subpath
+        yield filename, subpath, None
 
     subpath = subpath + '/' if subpath else ''
     cut = len(os.path.join(filename, ''))
     filter = {os.path.normcase(os.path.join(filename, f)) for f in (filter or ())}
-    filter_d = {os.path.join(f, '') for f in filter}
+    filter_d = tuple(os.path.join(f, '') for f in filter)
 
-    for root, dirs, files in os.walk(filename, followlinks=True):
-        for entry in itertools.chain(dirs, files):
-            src = os.path.join(root, entry)
+    for entry in _scandir_walk(filename):
+        src = entry.path
 
-            # apply the filter
-            if filter:
-                src_nc = os.path.normcase(src)
-                if src_nc not in filter:
-                    if not any(src_nc.startswith(f) for f in filter_d):
-                        continue
+        # apply the filter
+        if filter:
+            src_nc = os.path.normcase(src)
+            if src_nc not in filter and not src_nc.startswith(filter_d):
+                continue
 
-            # determine target subpath as dst
-            dst = util.unify_pathsep(src[cut:])
-            dst = subpath + dst
+        # determine target subpath as dst
+        dst = util.unify_pathsep(src[cut:])
+        dst = subpath + dst
+
+        yield src, dst, entry
+
+
+def _scandir_walk(top):
+    """Generate os.DirEntry(s) under top in the same order as iterating
+    os.walk(top, followlinks=True) with dirs before files.
+    """
+    stack = [top]
+    while stack:
+        root = stack.pop()
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            continue
 
-            yield src, dst
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+
+        yield from dirs
+        yield from files
+        stack.extend(entry.path for entry in reversed(dirs))
 
 
 def zip_copy(zsrc, base, zdst, subpath, filter=None, *,
@@ -1126,11 +1333,18 @@ def _zip_copy_gen(zsrc, base, zdst, subpath, filter=None, *,
             else:
                 if stream:
                     zinfo2.compress_type = zipfile.ZIP_STORED
+                elif _zip_can_copy_raw(zinfo, zh):
+                    _zip_copy_raw(zi, zinfo, zh, zinfo2, buffer_size)
+                    continue
+
                 with zi.open(zinfo) as ih, zh.open(zinfo2, 'w') as oh:
+                    if not stream:
+                        shutil.copyfileobj(ih, oh, buffer_size)
+                        continue
+
                     for chunk in iter(functools.partial(ih.read, buffer_size), b''):
                         oh.write(chunk)
-                        if stream:
-                            yield stream.get()
+                        yield stream.get()
 
     if stream:
         yield stream.get()
@@ -1138,6 +1352,74 @@ def _zip_copy_gen(zsrc, base, zdst, subpath, filter=None, *,
     return copied
 
 
+# same as zipfile.ZIP64_LIMIT
+_ZIP64_LIMIT = (1 << 31) - 1
+
+
+def _zip_can_copy_raw(zinfo, zh):
+    """Check whether the compressed data of a member can be copied as is."""
+    return (
+        zh._seekable
+        and not zinfo.flag_bits & 0x01  # encrypted
+        and zinfo.file_size <= _ZIP64_LIMIT
+        and zinfo.compress_size <= _ZIP64_LIMIT
+    )
+
+
+def _zip_copy_raw(zi, zinfo, zh, zinfo2, buffer_size=io.DEFAULT_BUFFER_SIZE):
+    """Copy a member with its compressed data as is, skipping the
+    decompression and recompression.
+    """
+    def gen():
+        # ZipExtFile._fileobj is positioned at the start of the compressed data
+        fh = ih._fileobj
+        remaining = zinfo.compress_size
+        while remaining > 0:
+            chunk = fh.read(min(remaining, buffer_size))
+            if not chunk:
+                raise EOFError
+            yield chunk
+            remaining -= len(chunk)
+
+    with zi.open(zinfo) as ih:
+        _zip_write_raw(zh, zinfo2, gen())
+
+
+def _zip_write_raw(zh, zinfo, chunks):
+    """Write a member whose size, compress_size and CRC are already set, with
+    its compressed data from chunks.
+
+    Mirrors ZipFile._open_to_write and _ZipWriteFile.close, except that size
+    and CRC are already known and written with the local header.
+    """
+    with zh._lock:
+        if zh._writing:
+            raise ValueError("Can't write to the ZIP file while there is "
+                             'another write handle open on it. '
+                             'Close the first handle before opening another.')
+
+        # the data descriptor is not needed as sizes and CRC are known
+        zinfo.flag_bits &= ~0x08
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16  # permissions: ?rw-------
+        if hasattr(zinfo, '_end_offset'):
+            # Python >= 3.12: don't keep the bound of a source entry
+            zinfo._end_offset = None
+
+        zh.fp.seek(zh.start_dir)
+        zinfo.header_offset = zh.fp.tell()
+        zh._writecheck(zinfo)
+        zh._didModify = True
+        zh.fp.write(zinfo.FileHeader(False))
+
+        for chunk in chunks:
+            zh.fp.write(chunk)
+
+        zh.start_dir = zh.fp.tell()
+        zh.filelist.append(zinfo)
+        zh.NameToInfo[zinfo.filename] = zinfo
+
+
 def _zip_copy_iter(zh, base, subpath, filter=None):
     if base:
         try:
@@ -1155,18 +1437,17 @@ def _zip_copy_iter(zh, base, subpath, filter=None):
     subpath = subpath + '/' if subpath else ''
     cut = len(base)
     filter = {base + f for f in (filter or ())}
-    filter_d = {f + '/' for f in filter}
+    filter_d = tuple(f + '/' for f in filter)
 
     for zinfo in zh.infolist():
         src = zinfo.filename
-        if not src.startswith(base):
+        if cut and not src.startswith(base):
             continue
 
         # apply the filter
         if filter:
-            if src not in filter:
-                if not any(src.startswith(f) for f in filter_d):
-                    continue
+            if src not in filter and not src.startswith(filter_d):
+                continue
 
         # determine target subpath as dst
         dst = subpath + src[cut:]
@@ -1193,30 +1474,34 @@ def zip_extract(zip, dst, subpath='', tzoffset=None):
         # trigger FileExistsError
         os.mkdir(dst)
 
-    tempdir = tempfile.mkdtemp()
+    # extract beside dst so that the final move is a rename rather than a
+    # copy across filesystems
+    parent = os.path.dirname(os.path.abspath(dst))
+    os.makedirs(parent, exist_ok=True)
+    tempdir = tempfile.mkdtemp(dir=parent)
     try:
         with nullcontext(zip) if isinstance(zip, zipfile.ZipFile) else zipfile.ZipFile(zip) as zh:
             if not subpath:
-                entries = zh.namelist()
+                zinfos = zh.infolist()
             else:
                 try:
-                    zh.getinfo(subpath)
+                    zinfo = zh.getinfo(subpath)
                 except KeyError:
-                    entries = [e for e in zh.namelist() if e.startswith(subpath + '/')]
+                    prefix = subpath + '/'
+                    zinfos = [i for i in zh.infolist() if i.filename.startswith(prefix)]
                 else:
-                    entries = [subpath]
+                    zinfos = [zinfo]
 
             # extract entries and recover mtime
-            zh.extractall(tempdir, entries)
-            for entry in entries:
-                file = os.path.join(tempdir, entry)
-                zinfo = zh.getinfo(entry)
+            zh.extractall(tempdir, zinfos)
+            for zinfo in zinfos:
+                file = os.path.join(tempdir, zinfo.filename)
 
                 # @FIXME: utcoffset may be different across timestamps when DST
                 #         is used
                 ts = zip_timestamp(zinfo)
                 if tzoffset is not None:
-                    utcoffset = datetime.fromtimestamp(ts).astimezone().utcoffset().total_seconds()
+                    utcoffset = time.localtime(ts).tm_gmtoff
                     ts = ts + utcoffset - tzoffset
                 os.utime(file, (ts, ts))
 
@@ -1273,6 +1558,9 @@ def _zip_remove_members(zip, members, *, remove_physical=True, buffer_size=2**20
     All members (as zinfo) should exist in the zip; otherwise the zip file
     will erroneously end in an inconsistent state.
     """
+    # ZipInfo hashes by identity, so this is the membership test by zinfo
+    members = frozenset(members)
+
     with nullcontext(zip) if isinstance(zip, zipfile.ZipFile) else zipfile.ZipFile(zip, 'a') as self:
         with self._lock:
             fp = self.fp
@@ -1301,7 +1589,6 @@ def _zip_remove_members(zip, members, *, remove_physical=True, buffer_size=2**20
                     entry_offset += entry_size
 
                     # update caches
-                    self.filelist.remove(info)
                     try:
                         del self.NameToInfo[info.filename]
                     except KeyError:
@@ -1318,9 +1605,17 @@ def _zip_remove_members(zip, members, *, remove_physical=True, buffer_size=2**20
                         data = fp.read(min(entry_size - read_size, buffer_size))
                         fp.seek(info.header_offset + read_size)
                         fp.write(data)
-                        fp.flush()
                         read_size += len(data)
 
+            # the file object flushes pending writes itself when seeking back
+            # for a read, so a flush per chunk is not needed
+            if remove_physical and member_seen:
+                fp.flush()
+
+            # drop the members in one pass rather than a list.remove() per
+            # member
+            self.filelist[:] = [i for i in self.filelist if i not in members]
+
             # Avoid missing entry if entries have a duplicated name.
             # Reverse the order as NameToInfo normally stores the last added one.
             for info in reversed(self.filelist):
@@ -1338,7 +1633,7 @@ def _zip_remove_members(zip, members, *, remove_physical=True, buffer_size=2**20
 class ZipStream(io.RawIOBase):
     """A class for a streaming ZIP output."""
     def __init__(self):
-        self._buffer = b''
+        self._buffer = []
         self._size = 0
 
     def writable(self):
@@ -1347,12 +1642,15 @@ class ZipStream(io.RawIOBase):
     def write(self, b):
         if self.closed:
             raise RuntimeError('ZipStream has been closed')
-        self._buffer += b
+        # keep a copy of a mutable buffer, which may be reused by the caller
+        self._buffer.append(b if isinstance(b, bytes) else bytes(b))
         return len(b)
 
     def get(self):
-        chunk = self._buffer
-        self._buffer = b''
+        # join copies the written data once, or not at all for a single
+        # write, while the output stays bytes as WSGI requires
+        chunk = b''.join(self._buffer)
+        self._buffer.clear()
         self._size += len(chunk)
         return chunk
 
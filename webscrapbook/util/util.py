@@ -182,6 +182,17 @@ def unify_pathsep(text):
     return text
 
 
+VALIDATE_FILENAME_REGEX_SPACES = re.compile(r'[\t\n\f\r]+')
+VALIDATE_FILENAME_REGEX_RESERVED = re.compile(r'^(CON|PRN|AUX|NUL|COM\d|LPT\d)((?:\..+)?)$', re.I)
+VALIDATE_FILENAME_TRANS = {
+    # control chars are bad for filename
+    **dict.fromkeys((*range(0x00, 0x20), *range(0x7F, 0xA0)), None),
+
+    # bad chars on most OS
+    **dict.fromkeys(map(ord, ':"?*\\/|<>'), '_'),
+}
+
+
 def validate_filename(filename, force_ascii=False):
     """Transliterates the given string to be a safe filename
 
@@ -191,22 +202,19 @@ def validate_filename(filename, force_ascii=False):
 
     # common restrictions
     # - collapse document spaces
-    fn = re.sub(r'[\t\n\f\r]+', ' ', fn)
-
-    # - control chars are bad for filename
-    fn = re.sub(r'[\x00-\x1F\x7F\x80-\x9F]+', '', fn)
+    fn = VALIDATE_FILENAME_REGEX_SPACES.sub(' ', fn)
 
-    # - bad chars on most OS
-    fn = re.sub(r'[:"?*\\/|<>]', '_', fn)
+    # - control chars and bad chars
+    fn = fn.translate(VALIDATE_FILENAME_TRANS)
 
     # Windows restrictions
     # - leading/trailing spaces and dots
-    fn = re.sub(r'^ +', '', fn)
-    fn = re.sub(r'[. ]+$', '', fn)
-    fn = re.sub(r'^\.', '_.', fn)
+    fn = fn.lstrip(' ').rstrip('. ')
+    if fn.startswith('.'):
+        fn = '_' + fn
 
     # - reserved filenames
-    fn = re.sub(r'^(CON|PRN|AUX|NUL|COM\d|LPT\d)((?:\..+)?)$', r'\g<1>_\g<2>', fn, flags=re.I)
+    fn = VALIDATE_FILENAME_REGEX_RESERVED.sub(r'\g<1>_\g<2>', fn)
 
     if force_ascii:
         fn = quote(fn, safe="""!_#$%&'()*+,-./:;<=>?@[\\]^_`{|}~""")